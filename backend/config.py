@@ -7,6 +7,7 @@ class Settings(BaseSettings):
     
     # Deepseek API配置
     DEEPSEEK_API_KEY: str
+    DEEPSEEK_MAX_CONCURRENCY: int = 8
 
     OPENAI_API_KEY: str
     OPENAI_BASE_URL: str
@@ -1,18 +1,21 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+import importlib
 import sys
 import os
 
 # 添加项目根目录到Python路径
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from routers import market_data, trading, fundamental, core_factor, arbitrage, trend_follow, dual_ma, obv_adx_ema, news, ai, signals, account, grid, support_resistance, soybean, stockfutures, holding_analysis
 from config import settings
 from utils.logger import logger
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    # orjson序列化大响应体（如豆粕月度对比数据）比标准json快数倍
+    default_response_class=ORJSONResponse
 )
 
 # 配置CORS
@@ -25,125 +28,33 @@ app.add_middleware(
 )
 logger.info("CORS中间件配置完成")
 
-# 注册路由
-app.include_router(
-    market_data.router,
-    prefix=f"{settings.API_V1_STR}/market",
-    tags=["market"]
-)
-logger.info("市场数据路由注册完成")
-
-app.include_router(
-    trading.router,
-    prefix=f"{settings.API_V1_STR}/trading",
-    tags=["trading"]
-)
-logger.info("交易策略路由注册完成")
-
-app.include_router(
-    fundamental.router,
-    prefix=f"{settings.API_V1_STR}/fundamental",
-    tags=["fundamental"]
-)
-logger.info("基本面分析路由注册完成")
-
-app.include_router(
-    core_factor.router,
-    prefix=f"{settings.API_V1_STR}/core-factor",
-    tags=["core_factor"]
-)
-logger.info("核心驱动因子分析路由注册完成")
-
-app.include_router(
-    arbitrage.router,
-    prefix=f"{settings.API_V1_STR}/arbitrage",
-    tags=["arbitrage"]
-)
-logger.info("套利策略路由注册完成")
-
-app.include_router(
-    trend_follow.router,
-    prefix=f"{settings.API_V1_STR}/trend_follow",
-    tags=["trend_follow"]
-)
-logger.info("趋势跟随策略路由注册完成")
-
-app.include_router(
-    dual_ma.router,
-    prefix=f"{settings.API_V1_STR}/dual_ma",
-    tags=["dual_ma"]
-)
-logger.info("双均线策略路由注册完成")
-
-app.include_router(
-    grid.router,
-    prefix=f"{settings.API_V1_STR}/grid",
-    tags=["grid"]
-)
-logger.info("网格策略路由注册完成")
-
-app.include_router(
-    obv_adx_ema.router,
-    prefix=f"{settings.API_V1_STR}/obv_adx_ema",
-    tags=["obv_adx_ema"]
-)
-logger.info("OBV、ADX与EMA组合策略路由注册完成")
-
-app.include_router(
-    support_resistance.router,
-    prefix=f"{settings.API_V1_STR}/support_resistance",
-    tags=["support_resistance"]
-)
-logger.info("支撑阻力策略路由注册完成")
-
-app.include_router(
-    news.router,
-    prefix=f"{settings.API_V1_STR}/news",
-    tags=["news"]
-)
-logger.info("新闻分析路由注册完成")
-
-app.include_router(
-    ai.router,
-    prefix=f"{settings.API_V1_STR}/ai",
-    tags=["ai"]
-)
-logger.info("AI分析路由注册完成")
-
-app.include_router(
-    signals.router,
-    prefix=f"{settings.API_V1_STR}",
-    tags=["signals"]
-)
-logger.info("信号路由注册完成")
-
-app.include_router(
-    account.router,
-    prefix=f"{settings.API_V1_STR}/account",
-    tags=["account"]
-)
-logger.info("账户路由注册完成")
-
-app.include_router(
-    soybean.router,
-    prefix=f"{settings.API_V1_STR}/soybean",
-    tags=["soybean"]
-)
-logger.info("大豆进口分析路由注册完成")
-
-app.include_router(
-    stockfutures.router,
-    prefix=f"{settings.API_V1_STR}/stockfutures",
-    tags=["stockfutures"]
-)
-logger.info("期股联动分析路由注册完成")
-
-app.include_router(
-    holding_analysis.router,
-    prefix=f"{settings.API_V1_STR}/holding",
-    tags=["holding"]
-)
-logger.info("持仓变化分析路由注册完成")
+# 路由注册表：(路由模块名, URL前缀, 标签, 日志名称)
+ROUTERS = [
+    ("market_data", "market", "market", "市场数据"),
+    ("trading", "trading", "trading", "交易策略"),
+    ("fundamental", "fundamental", "fundamental", "基本面分析"),
+    ("core_factor", "core-factor", "core_factor", "核心驱动因子分析"),
+    ("arbitrage", "arbitrage", "arbitrage", "套利策略"),
+    ("trend_follow", "trend_follow", "trend_follow", "趋势跟随策略"),
+    ("dual_ma", "dual_ma", "dual_ma", "双均线策略"),
+    ("grid", "grid", "grid", "网格策略"),
+    ("obv_adx_ema", "obv_adx_ema", "obv_adx_ema", "OBV、ADX与EMA组合策略"),
+    ("support_resistance", "support_resistance", "support_resistance", "支撑阻力策略"),
+    ("news", "news", "news", "新闻分析"),
+    ("ai", "ai", "ai", "AI分析"),
+    ("signals", "", "signals", "信号"),
+    ("account", "account", "account", "账户"),
+    ("soybean", "soybean", "soybean", "大豆进口分析"),
+    ("stockfutures", "stockfutures", "stockfutures", "期股联动分析"),
+    ("holding_analysis", "holding", "holding", "持仓变化分析"),
+]
+
+# 注册路由：统一走注册表驱动的循环，增删路由只改一行表项
+for module_name, prefix, tag, label in ROUTERS:
+    module = importlib.import_module(f"routers.{module_name}")
+    route_prefix = f"{settings.API_V1_STR}/{prefix}" if prefix else settings.API_V1_STR
+    app.include_router(module.router, prefix=route_prefix, tags=[tag])
+    logger.info(f"{label}路由注册完成")
 
 @app.on_event("startup")
 async def startup_event():
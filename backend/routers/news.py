@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Depends, Query
+from functools import lru_cache
 from typing import List, Optional
 from services.news_service import NewsService
 from utils.logger import logger
@@ -6,6 +7,7 @@ from models.news import FlashNews, NewsArticle
 
 router = APIRouter()
 
+@lru_cache(maxsize=1)
 def get_news_service() -> NewsService:
     logger.debug("创建新闻服务实例")
     return NewsService()
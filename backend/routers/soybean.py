@@ -1,4 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from functools import lru_cache
 from typing import List
 from datetime import datetime
 from services.soybean import SoybeanService
@@ -7,6 +9,7 @@ from utils.logger import logger
 
 router = APIRouter()
 
+@lru_cache(maxsize=1)
 def get_soybean_service() -> SoybeanService:
     logger.debug("创建大豆进口数据服务实例")
     return SoybeanService()
@@ -17,7 +20,8 @@ async def get_soybean_import_data(
 ):
     """获取大豆进口数据"""
     try:
-        data = service.get_soybean_import_data()
+        # 同步SQLAlchemy查询放入线程池执行，避免阻塞事件循环
+        data = await run_in_threadpool(service.get_soybean_import_data)
         if not data:
             raise HTTPException(status_code=404, detail="未找到大豆进口数据")
         return data
@@ -5,71 +5,173 @@ from services.trading import TradingService
 from utils.logger import logger
 import httpx
 from config import settings
-import json
-from openai import OpenAI
+import orjson
+from openai import AsyncOpenAI
 from fastapi.responses import StreamingResponse
 import asyncio
+import hashlib
+import time
+from functools import lru_cache
 from starlette.background import BackgroundTask
 from datetime import datetime
 
 router = APIRouter()
 
-# 初始化OpenAI客户端
-client = OpenAI(
+# 连接池按预期并发调大，长读超时适配流式LLM响应
+http_client = httpx.AsyncClient(
+    limits=httpx.Limits(
+        max_connections=100,
+        max_keepalive_connections=40,
+        keepalive_expiry=30
+    ),
+    timeout=httpx.Timeout(connect=5, read=300, write=30, pool=5)
+)
+
+# 初始化OpenAI异步客户端，避免LLM调用阻塞事件循环
+client = AsyncOpenAI(
     api_key=settings.DEEPSEEK_API_KEY,
-    base_url="https://ark.cn-beijing.volces.com/api/v3/bots"
+    base_url="https://ark.cn-beijing.volces.com/api/v3/bots",
+    http_client=http_client
 )
 
+# 限制并发的Deepseek调用数，超出的请求排队等待，避免打满上游限额和本地socket
+DEEPSEEK_SEM = asyncio.Semaphore(settings.DEEPSEEK_MAX_CONCURRENCY)
+
+# SSE帧微批量发送阈值：攒够字节数或超过时限即冲刷，减少send()系统调用
+SSE_FLUSH_BYTES = 2048
+SSE_FLUSH_INTERVAL = 0.05  # 秒
+
+# 按提示词哈希缓存完整的LLM回复，相同提示词24小时内直接回放不再调用上游
+_PROMPT_CACHE_TTL = 86400  # 秒
+_PROMPT_CACHE_MAX = 128  # 条目上限，每条是一份多KB的完整回复
+_prompt_cache: dict = {}
+
+def _prune_prompt_cache() -> None:
+    """清理过期的提示词缓存条目，超量时按插入顺序淘汰最旧的"""
+    now = time.monotonic()
+    for key in [k for k, v in _prompt_cache.items() if v[0] <= now]:
+        del _prompt_cache[key]
+    while len(_prompt_cache) > _PROMPT_CACHE_MAX:
+        del _prompt_cache[next(iter(_prompt_cache))]
+
+# 后台保存任务的强引用集合：事件循环只持弱引用，
+# 不留强引用的任务可能在执行前被垃圾回收
+_background_tasks: set = set()
+
+@lru_cache(maxsize=1)
 def get_trading_service() -> TradingService:
     return TradingService()
 
-async def stream_response(response, request: Request, date: str):
+async def _save_analysis(trading_service: TradingService, analysis: DailyStrategyAnalysis):
+    """后台保存策略分析，数据库写入放入线程池"""
+    try:
+        await asyncio.to_thread(trading_service.save_strategy_analysis, analysis)
+        logger.info(f"策略分析已保存到数据库 - 日期: {analysis.date}")
+    except Exception as e:
+        logger.error(f"保存策略分析到数据库失败: {str(e)}")
+
+async def _replay_cached_response(reasoning_content: str, content: str):
+    """把缓存的完整回复按SSE帧格式回放给客户端"""
+    if reasoning_content:
+        yield f"data: {orjson.dumps({'type': 'reasoning', 'delta': reasoning_content}).decode()}\n\n"
+    if content:
+        yield f"data: {orjson.dumps({'type': 'content', 'delta': content}).decode()}\n\n"
+    yield f"data: {orjson.dumps({'type': 'done', 'reasoning': reasoning_content, 'content': content}).decode()}\n\n"
+
+async def _watch_disconnect(request: Request, disconnected: asyncio.Event):
+    """监视客户端连接状态，断开时设置事件"""
+    try:
+        while not disconnected.is_set():
+            if await request.is_disconnected():
+                disconnected.set()
+                return
+            await asyncio.sleep(0.5)
+    except asyncio.CancelledError:
+        pass
+
+async def stream_response(response, request: Request, date: str, trading_service: TradingService, prompt_key: str = None):
     reasoning_content = ""
     content = ""
-    
+    # 独立的watchdog任务监视断连，主循环只查事件标志，
+    # 即使上游LLM卡在chunk中间也能及时发现客户端离开
+    disconnected = asyncio.Event()
+    watchdog = asyncio.create_task(_watch_disconnect(request, disconnected))
+    # LLM快速出token时将多个SSE帧合并发送，减少内核写系统调用
+    buffer: List[str] = []
+    buffer_size = 0
+    last_flush = time.monotonic()
+
     try:
-        for chunk in response:
-            # 检查客户端是否断开连接
-            if await request.is_disconnected():
+        async for chunk in response:
+            if disconnected.is_set():
                 logger.info("客户端断开连接")
                 break
-                
+
             try:
                 if hasattr(chunk, "references"):
                     pass
                 if not chunk.choices:
                     continue
+                # 只下发增量，由客户端拼接，避免每帧重发整个累积内容
                 if chunk.choices[0].delta.content:
                     content += chunk.choices[0].delta.content
-                    yield f"data: {json.dumps({'type': 'content', 'content': content})}\n\n"
+                    frame = f"data: {orjson.dumps({'type': 'content', 'delta': chunk.choices[0].delta.content}).decode()}\n\n"
                 elif hasattr(chunk.choices[0].delta, "reasoning_content"):
                     reasoning_content += chunk.choices[0].delta.reasoning_content
-                    yield f"data: {json.dumps({'type': 'reasoning', 'content': reasoning_content})}\n\n"
-                    
+                    frame = f"data: {orjson.dumps({'type': 'reasoning', 'delta': chunk.choices[0].delta.reasoning_content}).decode()}\n\n"
+                else:
+                    continue
+
+                buffer.append(frame)
+                buffer_size += len(frame)
+                now = time.monotonic()
+                if buffer_size >= SSE_FLUSH_BYTES or now - last_flush >= SSE_FLUSH_INTERVAL:
+                    yield "".join(buffer)
+                    buffer.clear()
+                    buffer_size = 0
+                    last_flush = now
+
             except Exception as e:
                 logger.error(f"处理chunk时出错: {str(e)}")
                 continue
-        
-        # 发送完成标记
-        yield f"data: {json.dumps({'type': 'done', 'reasoning': reasoning_content, 'content': content})}\n\n"
-        
-        # 保存到数据库
+
+        # 冲刷剩余缓冲并发送完成标记
+        if buffer:
+            yield "".join(buffer)
+            buffer.clear()
+        yield f"data: {orjson.dumps({'type': 'done', 'reasoning': reasoning_content, 'content': content}).decode()}\n\n"
+
+        # 完整回复进提示词缓存，供相同提示词直接回放
+        if prompt_key and content and not disconnected.is_set():
+            _prompt_cache[prompt_key] = (time.monotonic() + _PROMPT_CACHE_TTL, reasoning_content, content)
+            _prune_prompt_cache()
+
+        # 后台保存到数据库，不阻塞最后的done帧和连接关闭
         try:
-            trading_service = TradingService()
             analysis = DailyStrategyAnalysis(
                 date=date,  # 使用用户选择的日期
                 content=content,
                 reasoning_content=reasoning_content
             )
-            trading_service.save_strategy_analysis(analysis)
-            logger.info(f"策略分析已保存到数据库 - 日期: {date}")
+            task = asyncio.create_task(
+                _save_analysis(trading_service, analysis)
+            )
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
         except Exception as e:
             logger.error(f"保存策略分析到数据库失败: {str(e)}")
             
     except Exception as e:
         logger.error(f"流式响应出错: {str(e)}", exc_info=True)
-        yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+        yield f"data: {orjson.dumps({'type': 'error', 'message': str(e)}).decode()}\n\n"
     finally:
+        disconnected.set()
+        watchdog.cancel()
+        # 及时关闭上游流，释放Deepseek连接并停止计费token
+        try:
+            await response.close()
+        except Exception as e:
+            logger.error(f"关闭上游流失败: {str(e)}")
         logger.info("流式响应结束")
 
 @router.get("/options")
@@ -119,23 +221,48 @@ async def get_options_strategies(
 5、【请补充突发事件】 ```
 """
         logger.info(f"生成提示词：{prompt}")
-        try:
-            response = client.chat.completions.create(
-                model="bot-20250329163710-8zcqm",
-                messages=[{"role": "system", "content": "你是DeepSeek，是一个提示词工程专家"}, {"role": "user", "content": prompt}],
-                stream=False
-            )
-            content = response.choices[0].message.content
-            logger.info(f"生成提示词：{content}")
 
-            response = client.chat.completions.create(
-                model="bot-20250329163710-8zcqm",
-                messages=[{"role": "system", "content": "现在你是一个豆粕期货量化策略专家，请根据我给你的提示词，生成一份豆粕期货交易操作策略。"}, {"role": "user", "content": content}],
-                stream=True
+        # 相同提示词直接回放缓存的回复，省去一次完整的LLM调用
+        prompt_key = hashlib.sha256(prompt.encode()).hexdigest()
+        cached = _prompt_cache.get(prompt_key)
+        if cached and cached[0] > time.monotonic():
+            logger.info("命中提示词缓存，回放缓存的策略分析")
+            # 回放的结果同样落库：数据库按date做第一层缓存，不保存的话
+            # 该日期会一直打在提示词缓存上，TTL过期后又重新调用LLM
+            try:
+                analysis = DailyStrategyAnalysis(
+                    date=date,
+                    content=cached[2],
+                    reasoning_content=cached[1]
+                )
+                task = asyncio.create_task(_save_analysis(trading_service, analysis))
+                _background_tasks.add(task)
+                task.add_done_callback(_background_tasks.discard)
+            except Exception as e:
+                logger.error(f"保存策略分析到数据库失败: {str(e)}")
+            return StreamingResponse(
+                _replay_cached_response(cached[1], cached[2]),
+                media_type="text/event-stream"
             )
 
+        try:
+            async with DEEPSEEK_SEM:
+                response = await client.chat.completions.create(
+                    model="bot-20250329163710-8zcqm",
+                    messages=[{"role": "system", "content": "你是DeepSeek，是一个提示词工程专家"}, {"role": "user", "content": prompt}],
+                    stream=False
+                )
+                content = response.choices[0].message.content
+                logger.info(f"生成提示词：{content}")
+
+                response = await client.chat.completions.create(
+                    model="bot-20250329163710-8zcqm",
+                    messages=[{"role": "system", "content": "现在你是一个豆粕期货量化策略专家，请根据我给你的提示词，生成一份豆粕期货交易操作策略。"}, {"role": "user", "content": content}],
+                    stream=True
+                )
+
             return StreamingResponse(
-                stream_response(response, request, date),
+                stream_response(response, request, date, trading_service, prompt_key),
                 media_type="text/event-stream",
                 background=BackgroundTask(logger.info, "请求处理完成")
             )
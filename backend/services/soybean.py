@@ -1,28 +1,99 @@
+import time
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import date, datetime
+from dateutil.relativedelta import relativedelta
+import pandas as pd
 from config import settings
 from utils.logger import logger
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from models.soybean import (
     SoybeanImportDB, SoybeanImport, PortDetail, CustomsDetail,
     ComparisonData, PortDistributionData, PolicyEvent
 )
 
+# 进口数据最多每日更新一次，短TTL缓存避免每次请求重复查询和构建响应
+_IMPORT_CACHE_TTL = 300  # 秒
+_import_cache: Dict[str, Any] = {}
+
+# 月度对比图的值列与序列名映射
+_COMPARISON_TYPES = {
+    "current_shipment": "实际装船量",
+    "forecast_shipment": "预报装船量",
+    "current_arrival": "实际到港量",
+    "next_arrival": "预报到港量",
+}
+
+# 政策事件为静态数据，模块加载时构建一次，请求路径上不再重复校验
+_POLICY_EVENTS = (
+    PolicyEvent(
+        date="2024-01",
+        event="中美第一阶段经贸协议执行情况评估",
+        impact="关注中美农产品贸易承诺履行情况，影响大豆进口配额和关税政策",
+        type="贸易政策"
+    ),
+    PolicyEvent(
+        date="2024-02",
+        event="巴西大豆收获季节开始",
+        impact="巴西大豆产量预期下调，天气因素影响收获进度，出口竞争力减弱",
+        type="供应因素"
+    ),
+    PolicyEvent(
+        date="2024-02",
+        event="中央一号文件发布",
+        impact="强调保障粮食安全，提出扩大大豆种植面积，加强国产大豆生产",
+        type="产业政策"
+    ),
+    PolicyEvent(
+        date="2024-03",
+        event="国内油厂压榨利润转负",
+        impact="豆粕需求疲软，油厂开机率下降，影响进口采购积极性",
+        type="市场因素"
+    ),
+    PolicyEvent(
+        date="2024-03",
+        event="美豆种植意向报告发布",
+        impact="美国大豆种植面积预期增加，影响国际大豆价格走势",
+        type="市场因素"
+    ),
+    PolicyEvent(
+        date="2024-04",
+        event="阿根廷取消农产品出口税",
+        impact="提升阿根廷大豆出口竞争力，改变全球供应格局",
+        type="贸易政策"
+    )
+)
+
+# 引擎和会话工厂模块级创建一次，避免每个服务实例重建连接池
+_database_url = settings.DATABASE_URL or "sqlite:///./trading.db"
+if _database_url.startswith("sqlite"):
+    # SQLite单文件库：允许跨线程共享连接，无需连接池
+    engine = create_engine(
+        _database_url,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+else:
+    # 按并发worker数调大连接池，避免开盘高峰时池耗尽排队
+    engine = create_engine(
+        _database_url,
+        pool_size=20,
+        max_overflow=40,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        pool_timeout=5
+    )
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
 class SoybeanService:
     """大豆进口数据服务"""
-    
+
     def __init__(self):
         """初始化大豆进口数据服务"""
-        try:
-            # 初始化数据库连接
-            self.engine = create_engine(settings.DATABASE_URL or "sqlite:///./trading.db")
-            self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
-            logger.info("大豆进口数据库连接初始化完成")
-        except Exception as e:
-            logger.error(f"大豆进口数据服务初始化失败: {e}")
-            self.engine = None
-            self.SessionLocal = None
+        self.engine = engine
+        self.SessionLocal = SessionLocal
+        logger.info("大豆进口数据库连接初始化完成")
 
     def _calculate_yoy(self, current: float, previous: float) -> float:
         """计算同比增长率"""
@@ -38,47 +109,30 @@ class SoybeanService:
 
     def _get_policy_events(self) -> List[PolicyEvent]:
         """获取政策事件数据"""
-        return [
-            PolicyEvent(
-                date="2024-01",
-                event="中美第一阶段经贸协议执行情况评估",
-                impact="关注中美农产品贸易承诺履行情况，影响大豆进口配额和关税政策",
-                type="贸易政策"
-            ),
-            PolicyEvent(
-                date="2024-02",
-                event="巴西大豆收获季节开始",
-                impact="巴西大豆产量预期下调，天气因素影响收获进度，出口竞争力减弱",
-                type="供应因素"
-            ),
-            PolicyEvent(
-                date="2024-02",
-                event="中央一号文件发布",
-                impact="强调保障粮食安全，提出扩大大豆种植面积，加强国产大豆生产",
-                type="产业政策"
-            ),
-            PolicyEvent(
-                date="2024-03",
-                event="国内油厂压榨利润转负",
-                impact="豆粕需求疲软，油厂开机率下降，影响进口采购积极性",
-                type="市场因素"
-            ),
-            PolicyEvent(
-                date="2024-03",
-                event="美豆种植意向报告发布",
-                impact="美国大豆种植面积预期增加，影响国际大豆价格走势",
-                type="市场因素"
-            ),
-            PolicyEvent(
-                date="2024-04",
-                event="阿根廷取消农产品出口税",
-                impact="提升阿根廷大豆出口竞争力，改变全球供应格局",
-                type="贸易政策"
-            )
-        ]
+        return list(_POLICY_EVENTS)
+
+    @staticmethod
+    def _find_period_row(df: pd.DataFrame, target: date, tolerance_days: int = 7) -> Optional[pd.Series]:
+        """按日期窗口在数据帧中定位目标期的行
+
+        数据为半月度且可能缺期，固定行偏移会错位到别的期数；
+        这里取距目标日期最近且偏差在容差内的行，找不到返回None。
+        """
+        if not len(df):
+            return None
+        delta = (df["date"] - pd.Timestamp(target)).abs()
+        idx = delta.idxmin()
+        if delta.loc[idx] <= pd.Timedelta(days=tolerance_days):
+            return df.loc[idx]
+        return None
 
     def get_soybean_import_data(self) -> SoybeanImport:
         """获取大豆进口数据"""
+        # 命中缓存直接返回，模块级缓存在服务实例间共享
+        cached = _import_cache.get("import_data")
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
         db = None
         try:
             db = self.SessionLocal()
@@ -101,98 +155,60 @@ class SoybeanService:
                     policy_events=self._get_policy_events()
                 )
             
-            # 获取去年同期数据
-            last_year_date = current_data.date - timedelta(days=365)
-            prev_year_data = db.query(SoybeanImportDB).filter(
-                SoybeanImportDB.date >= last_year_date,
-                SoybeanImportDB.date < last_year_date + timedelta(days=7)
-            ).first()
-            
-            # 获取上月数据
-            last_month_date = current_data.date - timedelta(days=30)
-            prev_month_data = db.query(SoybeanImportDB).filter(
-                SoybeanImportDB.date >= last_month_date,
-                SoybeanImportDB.date < last_month_date + timedelta(days=7)
-            ).first()
-            
+            # 一次取出去年1月1日以来的两年窗口数据，
+            # 同环比和月度对比都从这一个结果集里取，不再做额外的点查询
+            current_year = current_data.date.year
+            last_year = current_year - 1
+            try:
+                year_query = db.query(
+                    SoybeanImportDB.date,
+                    SoybeanImportDB.current_shipment,
+                    SoybeanImportDB.forecast_shipment,
+                    SoybeanImportDB.current_arrival,
+                    SoybeanImportDB.next_arrival
+                ).filter(
+                    # date列带索引，between走索引范围扫描
+                    SoybeanImportDB.date.between(
+                        date(last_year, 1, 1), date(current_year, 12, 31)
+                    )
+                ).order_by(SoybeanImportDB.date.asc())
+                year_df = pd.read_sql(year_query.statement, db.bind, parse_dates=["date"])
+            except Exception as e:
+                logger.error(f"获取年度数据失败: {e}")
+                year_df = pd.DataFrame()
+
+            # 在已取回的窗口里按日期定位去年同期和上月的行：
+            # 数据是半月度的，按行偏移会错位，按日期窗口才对得上期数
+            prev_year_row = self._find_period_row(
+                year_df, current_data.date - relativedelta(years=1)
+            )
+            prev_month_row = self._find_period_row(
+                year_df, current_data.date - relativedelta(months=1)
+            )
+
             # 构建月度对比数据
             monthly_comparison: List[ComparisonData] = []
             try:
-                # 获取去年1月1日以来的数据
-                current_year = current_data.date.year
-                last_year = current_year - 1
-                year_data = db.query(SoybeanImportDB).filter(
-                    SoybeanImportDB.date >= datetime(last_year, 1, 1),
-                    SoybeanImportDB.date <= datetime(current_year, 12, 31)
-                ).order_by(SoybeanImportDB.date.asc()).all()
-                
-                for data in year_data:
-                    # 实际装船量
-                    monthly_comparison.append(
-                        ComparisonData(
-                            month=data.date.strftime('%Y-%m-%d'),
-                            value=data.current_shipment,
-                            type="实际装船量"
-                        )
-                    )
-                    # 预测装船量
-                    monthly_comparison.append(
-                        ComparisonData(
-                            month=data.date.strftime('%Y-%m-%d'),
-                            value=data.forecast_shipment,
-                            type="预报装船量"
-                        )
-                    )
-                    # 实际到港量
-                    monthly_comparison.append(
-                        ComparisonData(
-                            month=data.date.strftime('%Y-%m-%d'),
-                            value=data.current_arrival,
-                            type="实际到港量"
-                        )
-                    )
-                    # 预测到港量
-                    monthly_comparison.append(
-                        ComparisonData(
-                            month=data.date.strftime('%Y-%m-%d'),
-                            value=data.next_arrival,
-                            type="预报到港量"
-                        )
+                if len(year_df):
+                    # melt在C层一次性把四个值列转成长表，替代逐行Python循环
+                    melted = year_df.melt(
+                        id_vars="date",
+                        value_vars=list(_COMPARISON_TYPES),
+                        var_name="type",
+                        value_name="value"
                     )
+                    melted["type"] = melted["type"].map(_COMPARISON_TYPES)
+                    melted["month"] = melted["date"].dt.strftime('%Y-%m-%d')
+                    monthly_comparison = [
+                        ComparisonData.model_construct(**record)
+                        for record in melted[["month", "value", "type"]].to_dict(orient="records")
+                    ]
             except Exception as e:
                 logger.error(f"构建月度对比数据失败: {e}")
                 monthly_comparison = []
 
-            # 添加示例政策事件数据
-            policy_events = [
-                {
-                    "date": "2024-01-15",
-                    "event": "中美第一阶段经贸协议执行情况评估",
-                    "impact": "可能影响大豆进口配额和关税政策",
-                    "type": "贸易政策"
-                },
-                {
-                    "date": "2024-02-01",
-                    "event": "巴西大豆收获季节开始",
-                    "impact": "供应量增加，价格可能下调",
-                    "type": "供应因素"
-                },
-                {
-                    "date": "2024-03-10",
-                    "event": "国内油厂补贴政策调整",
-                    "impact": "影响压榨利润，可能影响采购意愿",
-                    "type": "产业政策"
-                },
-                {
-                    "date": "2024-04-01",
-                    "event": "国际大豆期货价格波动",
-                    "impact": "贸易商观望情绪加重",
-                    "type": "市场因素"
-                }
-            ]
-
-            # 构建基础响应对象
-            result = SoybeanImport(
+            # 构建基础响应对象，字段均来自数据库，跳过Pydantic校验
+            result = SoybeanImport.model_construct(
                 date=current_data.date.strftime("%Y-%m-%d"),
                 # 装船数据
                 current_shipment=current_data.current_shipment,
@@ -212,57 +228,58 @@ class SoybeanService:
                 # 图表数据
                 monthly_comparison=monthly_comparison,
                 port_distribution=[
-                    PortDistributionData(
+                    PortDistributionData.model_construct(
                         port=detail["port"],
                         value=float(detail["current"]),
                         type="current"
                     )
                     for detail in current_data.port_details
                 ],
-                
+
                 # 详细数据
-                port_details=[PortDetail(**detail) for detail in current_data.port_details],
-                customs_details=[CustomsDetail(**detail) for detail in current_data.customs_details],
-                policy_events=policy_events,
+                port_details=[PortDetail.model_construct(**detail) for detail in current_data.port_details],
+                customs_details=[CustomsDetail.model_construct(**detail) for detail in current_data.customs_details],
+                policy_events=self._get_policy_events(),
                 created_at=datetime.now(),
                 updated_at=datetime.now()
             )
             
             # 计算同比数据
-            if prev_year_data:
+            if prev_year_row is not None:
                 result.current_shipment_yoy = self._calculate_yoy(
-                    current_data.current_shipment, 
-                    prev_year_data.current_shipment
+                    current_data.current_shipment,
+                    prev_year_row.current_shipment
                 )
                 result.forecast_shipment_yoy = self._calculate_yoy(
                     current_data.forecast_shipment,
-                    prev_year_data.forecast_shipment
+                    prev_year_row.forecast_shipment
                 )
                 result.current_arrival_yoy = self._calculate_yoy(
                     current_data.current_arrival,
-                    prev_year_data.current_arrival
+                    prev_year_row.current_arrival
                 )
                 result.next_arrival_yoy = self._calculate_yoy(
                     current_data.next_arrival,
-                    prev_year_data.next_arrival
+                    prev_year_row.next_arrival
                 )
-            
+
             # 计算环比数据
-            if prev_month_data:
+            if prev_month_row is not None:
                 result.current_shipment_mom = self._calculate_mom(
                     current_data.current_shipment,
-                    prev_month_data.current_shipment
+                    prev_month_row.current_shipment
                 )
                 result.forecast_shipment_mom = self._calculate_mom(
                     current_data.forecast_shipment,
-                    prev_month_data.forecast_shipment
+                    prev_month_row.forecast_shipment
                 )
                 result.current_arrival_mom = self._calculate_mom(
                     current_data.current_arrival,
-                    prev_month_data.current_arrival
+                    prev_month_row.current_arrival
                 )
             
             logger.info(f"成功获取大豆进口数据，当前日期：{current_data.date}")
+            _import_cache["import_data"] = (time.monotonic() + _IMPORT_CACHE_TTL, result)
             return result
             
         except Exception as e:
@@ -301,8 +318,7 @@ class SoybeanService:
                 )
 
             # 获取预测到港数据
-            next_month = current_date.replace(day=1) + timedelta(days=32)
-            next_month_start = next_month.replace(day=1)
+            next_month_start = current_date.replace(day=1) + relativedelta(months=1)
             
             forecast_data = db.query(SoybeanImportDB)\
                 .filter(SoybeanImportDB.date >= next_month_start)\
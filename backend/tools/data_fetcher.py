@@ -1,22 +1,442 @@
+import asyncio
+import concurrent.futures
+import threading
+import time
+from collections import OrderedDict, deque
+import aiohttp
+import orjson
+import requests
+from requests.adapters import HTTPAdapter, Retry
 import tushare as ts
 import pandas as pd
 from typing import Optional, Tuple, Dict
 from loguru import logger
+from pathlib import Path
 import os
 
+# tushare HTTP接口地址
+TUSHARE_HTTP_URL = "http://api.tushare.pro"
+
+# 资产类型到tushare日线接口名的映射
+_DAILY_API_NAMES = {
+    "stock": "daily",
+    "future": "fut_daily",
+    "fund": "fund_daily",
+}
+
+# 资产类型到tushare分钟接口名及附加参数的映射
+_MINUTE_API_SPECS = {
+    "stock": ("pro_bar", {}),
+    "future": ("ft_mins", {}),
+    "fund": ("pro_bar", {"asset": "FD"}),
+}
+
+# 旧版csv缓存的读取dtype：显式声明跳过pandas的类型推断采样，
+# 价格列用float32足够（tushare报价两位小数），内存减半
+_DAILY_DTYPES = {
+    "ts_code": "category",
+    "open": "float32",
+    "high": "float32",
+    "low": "float32",
+    "close": "float32",
+    "pre_close": "float32",
+    "pre_settle": "float32",
+    "settle": "float32",
+    "change": "float32",
+    "change1": "float32",
+    "pct_chg": "float32",
+    "vol": "float64",
+    "amount": "float64",
+    "oi": "float64",
+    "oi_chg": "float64",
+}
+
+# 进程内缓存上限
+_INFO_CACHE_MAX = 1024
+_DF_CACHE_MAX = 256
+
+# 单次批量请求携带的合约代码上限，超出则分批
+_BATCH_CODES_MAX = 10
+
 class DataFetcher:
     """数据获取类"""
-    
-    def __init__(self, token: str):
+
+    def __init__(self, token: str, calls_per_minute: int = 500):
         """初始化
-        
+
         Args:
             token: tushare token
+            calls_per_minute: tushare每分钟调用配额，并发取数时自限速
         """
         logger.info("初始化数据获取器")
         ts.set_token(token)
         self.pro = ts.pro_api()
-        
+        self._token = token
+        # 带连接池和重试的持久会话，注入tushare客户端后所有调用
+        # 复用TCP连接，省掉每次请求的握手开销
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3)
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        self._session = session
+        try:
+            from tushare.pro import client as _ts_client
+            _ts_client.requests = session
+        except Exception as e:
+            logger.warning(f"注入tushare持久会话失败，连接不复用: {str(e)}")
+        # 进程内LRU缓存：股票基本信息和已解析的缓存DataFrame，
+        # 热点key用字典查找替代网络调用或磁盘解析
+        self._info_cache: "OrderedDict[str, Optional[Dict]]" = OrderedDict()
+        self._df_cache: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        # 目录文件名集合缓存：一次scandir替代每次fetch的stat系统调用
+        self._dir_cache: Dict[str, set] = {}
+        # 保存目录的Path对象按目录缓存，拼路径省掉os.path.join的
+        # 平台分派和重复目录检查
+        self._save_dirs: Dict[str, Path] = {}
+        # 后台写线程池：磁盘写入与下一个网络请求重叠，不阻塞取数路径
+        self._write_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        # 令牌桶限频：并发worker自行排队等待配额，而不是触发限频错误后丢数据
+        self._calls_per_minute = calls_per_minute
+        self._rate_lock = threading.Lock()
+        self._call_times: deque = deque()
+
+    def _acquire_rate_slot(self) -> None:
+        """等待限频窗口内出现空余配额
+
+        最近60秒内的调用数达到calls_per_minute时，睡到最早一次调用过期。
+        """
+        while True:
+            with self._rate_lock:
+                now = time.monotonic()
+                while self._call_times and now - self._call_times[0] >= 60:
+                    self._call_times.popleft()
+                if len(self._call_times) < self._calls_per_minute:
+                    self._call_times.append(now)
+                    return
+                wait = 60 - (now - self._call_times[0])
+            logger.debug(f"达到tushare限频配额，等待{wait:.1f}秒")
+            time.sleep(wait)
+
+    def close(self):
+        """等待后台写任务落盘并释放资源"""
+        self._write_pool.shutdown(wait=True)
+
+    def _write_cache(self, df: pd.DataFrame, filepath: str) -> None:
+        """写入parquet缓存文件和csv副本，并更新目录列表缓存
+
+        daily_data下的csv是跨模块接口：market_data、support_resistance
+        等模块按固定文件名直接读取，刷新数据时必须同步更新，
+        否则那些接口会拿到过期数据或404。
+        """
+        try:
+            save_dir, filename = os.path.split(filepath)
+            # 目录保证走记忆化的_dir_contents：每个目录只付一次makedirs
+            # 的系统调用，写路径不依赖调用方先列过目录
+            contents = self._dir_contents(save_dir or ".")
+            df.to_parquet(filepath, engine="pyarrow", compression="snappy", index=False)
+            contents.add(filename)
+            csv_path = os.path.splitext(filepath)[0] + ".csv"
+            if "_daily_" in filename and "date" in df.columns \
+                    and pd.api.types.is_datetime64_any_dtype(df["date"]):
+                # 日线csv的读取方（market_data、grid等）按%Y%m%d严格解析
+                # 日期列，副本要转回基线格式；分钟csv的读取方期望
+                # %Y-%m-%d %H:%M:%S，datetime64默认输出即是
+                df.assign(date=df["date"].dt.strftime("%Y%m%d")).to_csv(csv_path, index=False)
+            else:
+                df.to_csv(csv_path, index=False)
+            contents.add(os.path.basename(csv_path))
+            logger.info(f"成功保存{len(df)}条记录到: {filepath}")
+        except Exception as e:
+            logger.error(f"写入缓存文件失败: {filepath}, {str(e)}")
+
+    def _save_path(self, save_dir: str, filename: str) -> str:
+        """拼接缓存文件路径，目录的Path对象首次使用时创建并缓存"""
+        p = self._save_dirs.get(save_dir)
+        if p is None:
+            p = Path(save_dir)
+            p.mkdir(parents=True, exist_ok=True)
+            self._save_dirs[save_dir] = p
+        return os.fspath(p / filename)
+
+    def _dir_contents(self, save_dir: str) -> set:
+        """返回目录下的文件名集合，首次访问时扫描并缓存"""
+        contents = self._dir_cache.get(save_dir)
+        if contents is None:
+            os.makedirs(save_dir, exist_ok=True)
+            contents = {entry.name for entry in os.scandir(save_dir)}
+            self._dir_cache[save_dir] = contents
+        return contents
+
+    def _cache_df(self, filepath: str, df: pd.DataFrame) -> None:
+        """把DataFrame放入进程内LRU缓存"""
+        self._df_cache[filepath] = df
+        self._df_cache.move_to_end(filepath)
+        if len(self._df_cache) > _DF_CACHE_MAX:
+            self._df_cache.popitem(last=False)
+
+    @staticmethod
+    def _read_legacy_csv(path: str) -> pd.DataFrame:
+        """读取旧版csv缓存，优先走pyarrow的多线程csv解析器
+
+        大文件上比pandas的单线程C解析器快数倍；pyarrow不可用时回退pandas。
+        """
+        try:
+            from pyarrow import csv as pa_csv
+            df = pa_csv.read_csv(path).to_pandas()
+            return df.astype({k: v for k, v in _DAILY_DTYPES.items() if k in df.columns})
+        except ImportError:
+            return pd.read_csv(path, dtype=_DAILY_DTYPES)
+
+    def _load_cached(self, filepath: str) -> Optional[pd.DataFrame]:
+        """读取缓存文件；存在旧版csv缓存时读取并转写为parquet"""
+        # 同进程刚读过的文件直接还对象，不再走磁盘
+        if filepath in self._df_cache:
+            self._df_cache.move_to_end(filepath)
+            return self._df_cache[filepath]
+        save_dir, filename = os.path.split(filepath)
+        contents = self._dir_contents(save_dir or ".")
+        if filename in contents:
+            logger.info(f"找到已存在的数据文件: {filename}")
+            df = pd.read_parquet(filepath, engine="pyarrow")
+            self._cache_df(filepath, df)
+            return df
+        legacy_name = os.path.splitext(filename)[0] + ".csv"
+        if legacy_name in contents:
+            logger.info(f"找到旧版csv缓存，转换为parquet: {legacy_name}")
+            df = self._read_legacy_csv(self._save_path(save_dir or ".", legacy_name))
+            # 转写前做与新取数路径相同的归一化：统一日期列名并解析成
+            # datetime64，保证同一缓存文件不因来源不同出现两种schema
+            df.rename(columns={"trade_date": "date", "trade_time": "date"}, inplace=True)
+            if "date" in df.columns and not pd.api.types.is_datetime64_any_dtype(df["date"]):
+                # 历史csv的日期可能是YYYYMMDD整数或带时间的字符串，
+                # 统一成文本后推断解析
+                df["date"] = pd.to_datetime(df["date"].astype(str), cache=True)
+            df.to_parquet(filepath, engine="pyarrow", compression="snappy", index=False)
+            contents.add(filename)
+            self._cache_df(filepath, df)
+            return df
+        return None
+
+    def _finalize_daily(self, df: pd.DataFrame, filepath: str) -> pd.DataFrame:
+        """统一日期列名、按日期排序并写入缓存文件"""
+        # 统一日期列名为date，原地改列名只换标签，不复制整帧数据
+        if "trade_date" in df.columns:
+            df.rename(columns={"trade_date": "date"}, inplace=True)
+
+        # 显式format走向量化的C解析路径，比逐元素推断格式快一个量级；
+        # cache=True让重复出现的日期字符串只解析一次
+        if not pd.api.types.is_datetime64_any_dtype(df["date"]):
+            df["date"] = pd.to_datetime(df["date"], format="%Y%m%d", cache=True)
+
+        # 写入前保证升序，读缓存路径无需再排。tushare通常按日期降序返回，
+        # 反转是O(n)的切片，比O(n log n)的排序便宜；已升序则什么都不做
+        if df["date"].is_monotonic_decreasing and not df["date"].is_monotonic_increasing:
+            df = df.iloc[::-1].reset_index(drop=True)
+        elif not df["date"].is_monotonic_increasing:
+            df.sort_values("date", kind="mergesort", inplace=True)
+
+        # 刚取回的帧同时放进进程内缓存，同进程重复请求不等写盘完成、
+        # 也不回读磁盘；写盘放到后台线程，取数路径立即返回
+        self._cache_df(filepath, df)
+        self._write_pool.submit(self._write_cache, df, filepath)
+        return df
+
+    def _raw_fetch(self, api_name: str, params: Dict) -> pd.DataFrame:
+        """直连tushare HTTP接口获取数据
+
+        SDK逐行把JSON组装成DataFrame；这里按列一次性构建，
+        大响应时省掉每行的Python对象开销。
+
+        Args:
+            api_name: tushare接口名，如 fut_daily
+            params: 接口参数
+
+        Returns:
+            接口返回数据DataFrame
+        """
+        payload = {
+            "api_name": api_name,
+            "token": self._token,
+            "params": params,
+            "fields": ""
+        }
+        self._acquire_rate_slot()
+        resp = self._session.post(TUSHARE_HTTP_URL, json=payload, timeout=30)
+        resp.raise_for_status()
+        # orjson解析大响应体比标准json快数倍，直接吃原始字节省一次解码
+        data = orjson.loads(resp.content)
+        if data.get("code") != 0:
+            raise RuntimeError(f"tushare接口返回错误: {data.get('msg')}")
+        body = data["data"]
+        return pd.DataFrame(body["items"], columns=body["fields"])
+
+    async def _post_async(self, session: aiohttp.ClientSession, api_name: str, params: Dict) -> pd.DataFrame:
+        """通过aiohttp直接调用tushare HTTP接口
+
+        Args:
+            session: 复用的aiohttp会话
+            api_name: tushare接口名，如 fut_daily
+            params: 接口参数
+
+        Returns:
+            接口返回数据DataFrame
+        """
+        payload = {
+            "api_name": api_name,
+            "token": self._token,
+            "params": params,
+            "fields": ""
+        }
+        # 限频等待放入线程，不阻塞事件循环上的其他请求
+        await asyncio.to_thread(self._acquire_rate_slot)
+        async with session.post(TUSHARE_HTTP_URL, json=payload) as resp:
+            data = orjson.loads(await resp.read())
+        if data.get("code") != 0:
+            raise RuntimeError(f"tushare接口返回错误: {data.get('msg')}")
+        body = data["data"]
+        return pd.DataFrame(body["items"], columns=body["fields"])
+
+    @staticmethod
+    def _date_chunks(start_date: str, end_date: str, years_per_chunk: int = 2):
+        """把YYYYMMDD日期范围切成不重叠的子区间
+
+        tushare单次请求约有6000行上限，长历史一次取会被静默截断。
+
+        Args:
+            start_date: 开始日期，格式：YYYYMMDD
+            end_date: 结束日期，格式：YYYYMMDD
+            years_per_chunk: 每个子区间覆盖的年数
+
+        Returns:
+            [(子区间开始, 子区间结束), ...]
+        """
+        start_year = int(start_date[:4])
+        end_year = int(end_date[:4])
+        chunks = []
+        year = start_year
+        while year <= end_year:
+            chunk_end_year = min(year + years_per_chunk - 1, end_year)
+            chunk_start = start_date if year == start_year else f"{year}0101"
+            chunk_end = end_date if chunk_end_year == end_year else f"{chunk_end_year}1231"
+            chunks.append((chunk_start, chunk_end))
+            year = chunk_end_year + 1
+        return chunks
+
+    async def get_daily_data_async(
+        self,
+        session: aiohttp.ClientSession,
+        code: str,
+        start_date: str,
+        end_date: str,
+        asset_type: str = "stock",
+        save_dir: str = "daily_data"
+    ) -> Optional[pd.DataFrame]:
+        """异步获取日线数据，与get_daily_data共用缓存文件
+
+        Args:
+            session: 复用的aiohttp会话
+            code: 证券代码
+            start_date: 开始日期，格式：YYYYMMDD
+            end_date: 结束日期，格式：YYYYMMDD
+            asset_type: 资产类型，可选：stock/future/fund
+            save_dir: 保存目录
+
+        Returns:
+            日线数据DataFrame
+        """
+        logger.info(f"开始异步获取{asset_type}数据: {code}, 时间范围: {start_date} - {end_date}")
+        try:
+            filename = f"{code}_{asset_type}_daily_{start_date}_{end_date}.parquet"
+            filepath = self._save_path(save_dir, filename)
+            cached = self._load_cached(filepath)
+            if cached is not None:
+                return cached
+
+            api_name = _DAILY_API_NAMES.get(asset_type)
+            if api_name is None:
+                logger.error(f"不支持的资产类型: {asset_type}")
+                raise ValueError(f"Unsupported asset type: {asset_type}")
+
+            if int(end_date[:4]) - int(start_date[:4]) > 5:
+                # 长历史分段并发取：避开单次请求的行数截断，
+                # N个小请求并发的耗时接近一次往返
+                frames = await asyncio.gather(*[
+                    self._post_async(
+                        session, api_name,
+                        {"ts_code": code, "start_date": chunk_start, "end_date": chunk_end}
+                    )
+                    for chunk_start, chunk_end in self._date_chunks(start_date, end_date)
+                ])
+                df = pd.concat(frames, ignore_index=True)
+                df.drop_duplicates(inplace=True)
+            else:
+                df = await self._post_async(
+                    session, api_name,
+                    {"ts_code": code, "start_date": start_date, "end_date": end_date}
+                )
+            return self._finalize_daily(df, filepath)
+
+        except Exception as e:
+            logger.error(f"获取数据失败: {str(e)}")
+            return None
+
+    async def get_multiple_contracts_daily_async(
+        self,
+        base_code: str,
+        start_contract: str,
+        end_contract: str,
+        start_date: str,
+        end_date: str,
+        asset_type: str = "future",
+        save_dir: str = "daily_data"
+    ) -> Dict[str, pd.DataFrame]:
+        """异步获取多个合约的日线数据
+
+        单线程事件循环上用asyncio.gather并发发出全部请求，
+        避免线程池的GIL竞争和线程创建开销。
+
+        Args:
+            base_code: 基础代码，如 "M"
+            start_contract: 起始合约，如 "M2001"
+            end_contract: 结束合约，如 "M2501"
+            start_date: 开始日期，格式：YYYYMMDD
+            end_date: 结束日期，格式：YYYYMMDD
+            asset_type: 资产类型，可选：stock/future/fund
+            save_dir: 保存目录
+
+        Returns:
+            合约数据字典，key为合约代码，value为DataFrame
+        """
+        logger.info(f"开始异步获取多个合约数据: {base_code} {start_contract}-{end_contract}")
+
+        start_year = int(start_contract[1:3])
+        end_year = int(end_contract[1:3])
+        month = start_contract[3:5]
+        contracts = [
+            f"{base_code}{year:02d}{month}.DCE"
+            for year in range(start_year, end_year + 1)
+        ]
+
+        async with aiohttp.ClientSession() as session:
+            frames = await asyncio.gather(*[
+                self.get_daily_data_async(
+                    session, code=contract,
+                    start_date=start_date, end_date=end_date,
+                    asset_type=asset_type, save_dir=save_dir
+                )
+                for contract in contracts
+            ])
+
+        return {
+            contract: df
+            for contract, df in zip(contracts, frames)
+            if df is not None and len(df) > 0
+        }
+
     def get_daily_data(
         self,
         code: str,
@@ -39,46 +459,37 @@ class DataFetcher:
         """
         logger.info(f"开始获取{asset_type}数据: {code}, 时间范围: {start_date} - {end_date}")
         try:
-            # 创建保存目录
-            if not os.path.exists(save_dir):
-                os.makedirs(save_dir)
-            
-            # 检查是否存在已有文件
-            filename = f"{code}_{asset_type}_daily_{start_date}_{end_date}.csv"
-            filepath = os.path.join(save_dir, filename)
-            if os.path.exists(filepath):
-                logger.info(f"找到已存在的数据文件: {filename}")
-                return pd.read_csv(filepath)
-
-            if asset_type == "stock":
-                logger.debug("获取股票日线数据")
-                df = self.pro.daily(ts_code=code, start_date=start_date, end_date=end_date)
-            elif asset_type == "future":
-                logger.debug("获取期货日线数据")
-                df = self.pro.fut_daily(ts_code=code, start_date=start_date, end_date=end_date)
-            elif asset_type == "fund":
-                logger.debug("获取ETF日线数据")
-                df = self.pro.fund_daily(ts_code=code, start_date=start_date, end_date=end_date)
-            else:
+            # 检查是否存在已有文件（_load_cached会确保保存目录存在）
+            filename = f"{code}_{asset_type}_daily_{start_date}_{end_date}.parquet"
+            filepath = self._save_path(save_dir, filename)
+            cached = self._load_cached(filepath)
+            if cached is not None:
+                return cached
+
+            # 查表分派接口名，与异步路径共用同一张映射表
+            api_name = _DAILY_API_NAMES.get(asset_type)
+            if api_name is None:
                 logger.error(f"不支持的资产类型: {asset_type}")
                 raise ValueError(f"Unsupported asset type: {asset_type}")
-                
-            # 统一日期列名为date
-            if "trade_date" in df.columns:
-                df = df.rename(columns={"trade_date": "date"})
+            logger.debug(f"获取{asset_type}日线数据")
+            if int(end_date[:4]) - int(start_date[:4]) > 5:
+                # 长历史分段取回再合并，避开单次请求的行数截断
+                frames = [
+                    self._raw_fetch(api_name, {
+                        "ts_code": code, "start_date": chunk_start, "end_date": chunk_end
+                    })
+                    for chunk_start, chunk_end in self._date_chunks(start_date, end_date)
+                ]
+                df = pd.concat(frames, ignore_index=True)
+                df.drop_duplicates(inplace=True)
+            else:
+                df = self._raw_fetch(api_name, {"ts_code": code, "start_date": start_date, "end_date": end_date})
+
+            return self._finalize_daily(df, filepath)
 
-            # 按日期升序排序
-            df = df.sort_values("date")
-            
-            # 保存到csv
-            df.to_csv(filepath, index=False)
-            logger.info(f"成功保存{len(df)}条记录到: {filepath}")
-            
-            return df
-            
         except Exception as e:
             logger.error(f"获取数据失败: {str(e)}")
-            return None 
+            return None
 
     def get_multiple_contracts_daily(
         self,
@@ -88,10 +499,11 @@ class DataFetcher:
         start_date: str,
         end_date: str,
         asset_type: str = "future",
-        save_dir: str = "daily_data"
+        save_dir: str = "daily_data",
+        max_workers: int = 8
     ) -> Dict[str, pd.DataFrame]:
         """获取多个合约的日线数据
-        
+
         Args:
             base_code: 基础代码，如 "M"
             start_contract: 起始合约，如 "M2001"
@@ -100,30 +512,108 @@ class DataFetcher:
             end_date: 结束日期，格式：YYYYMMDD
             asset_type: 资产类型，可选：stock/future/fund
             save_dir: 保存目录
-            
+            max_workers: 并发获取的线程数
+
         Returns:
             合约数据字典，key为合约代码，value为DataFrame
         """
         logger.info(f"开始获取多个合约数据: {base_code} {start_contract}-{end_contract}")
-        
+
         # 解析合约范围
         start_year = int(start_contract[1:3])  # 取年份的后两位
         end_year = int(end_contract[1:3])
         month = start_contract[3:5]  # 取月份
-        
+
+        contracts = [
+            f"{base_code}{year:02d}{month}.DCE"  # 使用两位数字格式化年份
+            for year in range(start_year, end_year + 1)
+        ]
+
+        # 先吃缓存，剩余合约用逗号分隔的多代码请求一次取回，
+        # 把N次HTTP握手和限频配额摊到一次调用上
         results = {}
-        for year in range(start_year, end_year + 1):
-            contract = f"{base_code}{year:02d}{month}.DCE"  # 使用两位数字格式化年份
-            df = self.get_daily_data(
-                code=contract,
-                start_date=start_date,
-                end_date=end_date,
-                asset_type=asset_type,
-                save_dir=save_dir
+        missing = {}
+        for contract in contracts:
+            filepath = self._save_path(
+                save_dir, f"{contract}_{asset_type}_daily_{start_date}_{end_date}.parquet"
             )
-            if df is not None and len(df) > 0:  # 只保存有数据的合约
-                results[contract] = df
-                
+            cached = self._load_cached(filepath)
+            if cached is not None and len(cached) > 0:
+                results[contract] = cached
+            else:
+                missing[contract] = filepath
+
+        if missing:
+            api_name = _DAILY_API_NAMES.get(asset_type)
+            if api_name is None:
+                logger.error(f"不支持的资产类型: {asset_type}")
+                raise ValueError(f"Unsupported asset type: {asset_type}")
+            try:
+                codes = list(missing)
+                for start in range(0, len(codes), _BATCH_CODES_MAX):
+                    batch = codes[start:start + _BATCH_CODES_MAX]
+                    # 批量响应行数是单合约的N倍，长历史一次取必撞上
+                    # tushare的单次行数上限且被静默截断；按两年分段取回
+                    # 再合并（10个合约×2年约5000行，在上限之内），
+                    # 避免截断的结果被永久写进缓存
+                    frames = [
+                        self._raw_fetch(api_name, {
+                            "ts_code": ",".join(batch),
+                            "start_date": chunk_start,
+                            "end_date": chunk_end
+                        })
+                        for chunk_start, chunk_end in self._date_chunks(start_date, end_date)
+                    ]
+                    df = pd.concat(frames, ignore_index=True)
+                    df.drop_duplicates(inplace=True)
+                    if len(df) == 0:
+                        continue
+                    # 合约代码重复率极高，转category后按整数码分组，
+                    # 省去每行一份的字符串比较和内存
+                    df["ts_code"] = df["ts_code"].astype("category")
+                    for ts_code, group in df.groupby("ts_code", observed=True):
+                        if ts_code not in missing:
+                            continue
+                        saved = self._finalize_daily(group.reset_index(drop=True), missing[ts_code])
+                        if len(saved) > 0:  # 只保存有数据的合约
+                            results[ts_code] = saved
+            except Exception as e:
+                logger.error(f"批量获取合约数据失败，回退到逐合约获取: {str(e)}")
+                remaining = [c for c in missing if c not in results]
+                results.update(self._fetch_contracts_threaded(
+                    remaining, start_date, end_date, asset_type, save_dir, max_workers
+                ))
+
+        return results
+
+    def _fetch_contracts_threaded(
+        self,
+        contracts,
+        start_date: str,
+        end_date: str,
+        asset_type: str,
+        save_dir: str,
+        max_workers: int
+    ) -> Dict[str, pd.DataFrame]:
+        """线程池并发逐合约获取，批量接口不可用时的回退路径"""
+        results = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self.get_daily_data,
+                    code=contract,
+                    start_date=start_date,
+                    end_date=end_date,
+                    asset_type=asset_type,
+                    save_dir=save_dir
+                ): contract
+                for contract in contracts
+            }
+            for future in concurrent.futures.as_completed(futures):
+                contract = futures[future]
+                df = future.result()
+                if df is not None and len(df) > 0:  # 只保存有数据的合约
+                    results[contract] = df
         return results
 
     def get_stock_info(self, code: str) -> Optional[Dict]:
@@ -135,18 +625,27 @@ class DataFetcher:
         Returns:
             股票基本信息字典
         """
+        # 基本信息几乎不变，重复代码直接走进程内缓存
+        if code in self._info_cache:
+            self._info_cache.move_to_end(code)
+            return self._info_cache[code]
+
         logger.info(f"获取股票基本信息: {code}")
         try:
             # 获取股票基本信息
             df = self.pro.stock_basic(ts_code=code, fields='ts_code,name,area,industry')
             if len(df) > 0:
-                return df.iloc[0].to_dict()
+                info = df.iloc[0].to_dict()
             else:
                 logger.warning(f"未找到股票信息: {code}")
-                return None
+                info = None
+            self._info_cache[code] = info
+            if len(self._info_cache) > _INFO_CACHE_MAX:
+                self._info_cache.popitem(last=False)
+            return info
         except Exception as e:
             logger.error(f"获取股票信息失败: {str(e)}")
-            return None 
+            return None
 
     def get_minute_data(
         self,
@@ -172,45 +671,46 @@ class DataFetcher:
         """
         logger.info(f"开始获取{asset_type}分钟数据: {code}, 频率: {freq}, 时间范围: {start_date} - {end_date}")
         try:
-            # 创建保存目录
-            if not os.path.exists(save_dir):
-                os.makedirs(save_dir)
-            
-            # 检查是否存在已有文件
-            filename = f"{code}_{asset_type}_{freq}_{start_date}_{end_date}.csv"
-            filepath = os.path.join(save_dir, filename)
-            if os.path.exists(filepath):
-                logger.info(f"找到已存在的数据文件: {filename}")
-                return pd.read_csv(filepath)
-                
-            # 根据资产类型获取分钟数据
-            if asset_type == "stock":
-                logger.debug("获取股票分钟数据")
-                df = self.pro.pro_bar(ts_code=code, start_date=start_date, end_date=end_date, freq=freq)
-            elif asset_type == "future":
-                logger.debug("获取期货分钟数据")
-                df = self.pro.ft_mins(ts_code=code, start_date=start_date, end_date=end_date, freq=freq)
-            elif asset_type == "fund":
-                logger.debug("获取ETF分钟数据")
-                df = self.pro.pro_bar(ts_code=code, start_date=start_date, end_date=end_date, freq=freq, asset="FD")
-            else:
+            # 检查是否存在已有文件（_load_cached会确保保存目录存在）
+            filename = f"{code}_{asset_type}_{freq}_{start_date}_{end_date}.parquet"
+            filepath = self._save_path(save_dir, filename)
+            cached = self._load_cached(filepath)
+            if cached is not None:
+                return cached
+
+            # 根据资产类型查表分派分钟接口及附加参数
+            spec = _MINUTE_API_SPECS.get(asset_type)
+            if spec is None:
                 logger.error(f"不支持的资产类型: {asset_type}")
                 return None
+            api_name, extra_params = spec
+            logger.debug(f"获取{asset_type}分钟数据")
+            df = self._raw_fetch(api_name, {
+                "ts_code": code, "start_date": start_date, "end_date": end_date,
+                "freq": freq, **extra_params
+            })
             
             if df is None or len(df) == 0:
                 logger.warning(f"未获取到数据")
                 return None
                 
-            # 统一日期列名
+            # 统一日期列名，原地改列名避免整帧复制
             if "trade_time" in df.columns:
-                df = df.rename(columns={"trade_time": "date"})
-                
-            # 按时间升序排序
-            df = df.sort_values("date")
-            
-            # 保存到csv
-            df.to_csv(filepath, index=False)
-            logger.info(f"成功保存{len(df)}条记录到: {filepath}")
+                df.rename(columns={"trade_time": "date"}, inplace=True)
+
+            # 显式format向量化解析分钟时间戳，跳过格式推断
+            if not pd.api.types.is_datetime64_any_dtype(df["date"]):
+                df["date"] = pd.to_datetime(df["date"], format="%Y-%m-%d %H:%M:%S", cache=True)
+
+            # 写入前保证升序：降序时反转，乱序才真正排序
+            if df["date"].is_monotonic_decreasing and not df["date"].is_monotonic_increasing:
+                df = df.iloc[::-1].reset_index(drop=True)
+            elif not df["date"].is_monotonic_increasing:
+                df.sort_values("date", kind="mergesort", inplace=True)
+
+            # 进缓存后写盘放到后台线程，取数路径立即返回
+            self._cache_df(filepath, df)
+            self._write_pool.submit(self._write_cache, df, filepath)
             return df
             
         except Exception as e:
@@ -256,4 +756,7 @@ if __name__ == "__main__":
         save_dir="daily_data"
     )
     
+    # 等待后台写任务全部落盘
+    fetcher.close()
+
     logger.info("数据获取并保存成功")
\ No newline at end of file
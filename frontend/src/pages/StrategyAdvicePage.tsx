@@ -46,13 +46,13 @@ const StrategyAdvicePage: React.FC = () => {
             if (line.startsWith('data: ')) {
               const data = JSON.parse(line.slice(6));
               if (data.type === 'reasoning') {
-                setStrategyData(prev => ({ 
-                  reasoning_content: data.content,
+                setStrategyData(prev => ({
+                  reasoning_content: (prev?.reasoning_content || '') + data.delta,
                   content: prev?.content || ''
                 }));
               } else if (data.type === 'content') {
-                setStrategyData(prev => ({ 
-                  content: data.content,
+                setStrategyData(prev => ({
+                  content: (prev?.content || '') + data.delta,
                   reasoning_content: prev?.reasoning_content || ''
                 }));
               } else if (data.type === 'done') {